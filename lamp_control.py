@@ -11,10 +11,36 @@ Examples:
 """
 
 import sys
-import requests
-import json
+import os
 import time
-from typing import Optional
+
+# requests (and its urllib3/certifi/idna baggage) costs ~100ms to import
+# on small boards, dominating one-shot CLI calls. It is imported lazily
+# inside LampController so usage/help/menu-prompt paths never pay for it.
+# asyncio, httpx and uvloop are likewise deferred into the async classes:
+# none of them is reachable from the sync CLI path.
+
+# Prefer orjson for faster status parsing; fall back to stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both json.JSONDecodeError and orjson.JSONDecodeError subclass ValueError,
+# so one tuple covers whichever parser is in use without importing json here
+_JSON_DECODE_ERRORS = (ValueError,)
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    import json
+    return json.loads(raw)
+
+
+# Param dicts for the quick-timer presets, built once
+_QUICK_TIMER_PARAMS = {n: {"minutes": n} for n in (0, 5, 30, 60)}
 
 # Colors for terminal output
 class Colors:
@@ -25,120 +51,615 @@ class Colors:
     CYAN = '\033[0;36m'
     RESET = '\033[0m'
 
+# Honor the NO_COLOR convention and skip ANSI noise when piping to a file
+# or running under systemd. Blanking the attributes once at import keeps
+# every f-string below working with zero per-call overhead.
+if not sys.stdout.isatty() or "NO_COLOR" in os.environ:
+    for _name in ("RED", "GREEN", "BLUE", "YELLOW", "CYAN", "RESET"):
+        setattr(Colors, _name, "")
+
 class LampController:
-    def __init__(self, ip_address: str):
+    # Messages built once at class definition instead of per call
+    _MSG_ON = f"{Colors.YELLOW}Turning lamp ON...{Colors.RESET}"
+    _MSG_ON_OK = f"{Colors.GREEN}Lamp turned ON successfully!{Colors.RESET}"
+    _MSG_OFF = f"{Colors.YELLOW}Turning lamp OFF...{Colors.RESET}"
+    _MSG_OFF_OK = f"{Colors.GREEN}Lamp turned OFF successfully!{Colors.RESET}"
+    _MSG_STATUS = f"{Colors.YELLOW}Getting lamp status...{Colors.RESET}"
+    _MSG_TIMER_CANCEL = f"{Colors.YELLOW}Cancelling timer...{Colors.RESET}"
+    _MSG_TIMER_CANCEL_OK = f"{Colors.GREEN}Timer cancelled successfully!{Colors.RESET}"
+
+    def __init__(self, ip_address: str, quiet: bool = False, compat: bool = False):
         self.ip_address = ip_address
         self.base_url = f"http://{ip_address}"
         self.timeout = 5
-    
-    def _make_request(self, endpoint: str, params: dict = None) -> tuple[bool, Optional[dict]]:
+        self.quiet = quiet
+        self.compat = compat
+        # Endpoint URLs built once instead of per request
+        self._urls = {endpoint: f"{self.base_url}/{endpoint}"
+                      for endpoint in ("on", "off", "status", "timeout")}
+        # Short-lived /status cache so rapid re-polls skip the round-trip
+        self._status_cache: "tuple | None" = None
+        self.status_ttl = 1.0
+        # Optimistic until the firmware 404s the /batch probe once
+        self._batch_supported = True
+        # Default transport is a single keep-alive http.client connection:
+        # the firmware only speaks plain HTTP/1.1 GETs, so the full
+        # requests stack (cookies, charset sniffing, redirects) is pure
+        # overhead. --compat keeps the requests path for users who need
+        # proxy support. Both are created lazily on first use.
+        self._conn = None
+        self._session = None
+        if compat:
+            # Deferred so one-shot CLI help/usage paths skip the import
+            # cost; Python caches the module, so reconstruction is free.
+            # Transient blips (ECONNRESET, 5xx) get a quick automatic
+            # retry on the warm socket instead of bailing out.
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+            except ImportError:
+                raise RuntimeError("requests is required for --compat mode (pip install requests)")
+
+            self._session = requests.Session()
+            retry = Retry(total=2, connect=2, read=1, backoff_factor=0.1,
+                          status_forcelist=[500, 502, 503, 504],
+                          allowed_methods=frozenset(["GET", "POST"]))
+            self._session.mount("http://", HTTPAdapter(max_retries=retry,
+                                                       pool_connections=1, pool_maxsize=4))
+
+    def close(self):
+        """Close the underlying HTTP connection/session"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._session is not None:
+            self._session.close()
+
+    def _request_raw(self, method: str, path: str, body: bytes = None,
+                     headers: dict = None) -> tuple[int, bytes]:
+        """Issue one request on the persistent http.client connection.
+
+        Reconnects once if the lamp closed the idle keep-alive socket.
+        """
+        import http.client
+
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.ip_address, timeout=self.timeout)
+
+        try:
+            for retry in (False, True):
+                try:
+                    self._conn.request(method, path, body=body, headers=headers or {})
+                    response = self._conn.getresponse()
+                    return response.status, response.read()
+                except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                    self._conn.close()
+                    self._conn = http.client.HTTPConnection(self.ip_address, timeout=self.timeout)
+                    if retry:
+                        raise
+        except Exception:
+            # A refused connect or timeout leaves HTTPConnection in
+            # Request-started/sent state, where every later request would
+            # fail with CannotSendRequest. Drop the connection so the next
+            # call starts from a fresh socket once the lamp is back.
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            raise
+        raise AssertionError("unreachable")
+
+    def _make_request(self, endpoint: str, params: dict = None) -> tuple[bool, "dict | None"]:
         """Make HTTP request to lamp controller"""
+        if self.compat:
+            return self._make_request_compat(endpoint, params)
+
+        import http.client
+        import urllib.parse
         try:
-            url = f"{self.base_url}/{endpoint}"
-            response = requests.get(url, params=params, timeout=self.timeout)
+            path = f"/{endpoint}"
+            if params:
+                path += "?" + urllib.parse.urlencode(params)
+            status, body = self._request_raw("GET", path)
+            if status >= 400:
+                raise http.client.HTTPException(f"HTTP {status}")
+
+            # Try to parse JSON if response contains it
+            try:
+                return True, _json_loads(body)
+            except _JSON_DECODE_ERRORS:
+                return True, None
+
+        except (OSError, http.client.HTTPException) as e:
+            print(f"{Colors.RED}Error: Could not connect to lamp at {self.ip_address}{Colors.RESET}")
+            print(f"Make sure the IP address is correct and lamp is online.")
+            print(f"Details: {e}")
+            return False, None
+
+    def _make_request_compat(self, endpoint: str, params: dict = None) -> tuple[bool, "dict | None"]:
+        """requests-based transport, kept for proxy users (--compat)"""
+        import requests
+        try:
+            url = self._urls.get(endpoint) or f"{self.base_url}/{endpoint}"
+            response = self._session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            
+
             # Try to parse JSON if response contains it
             try:
-                return True, response.json()
-            except json.JSONDecodeError:
+                return True, _json_loads(response.content)
+            except _JSON_DECODE_ERRORS:
                 return True, None
-                
+
         except requests.exceptions.RequestException as e:
             print(f"{Colors.RED}Error: Could not connect to lamp at {self.ip_address}{Colors.RESET}")
             print(f"Make sure the IP address is correct and lamp is online.")
             print(f"Details: {e}")
             return False, None
-    
-    def turn_on(self) -> bool:
+
+    def batch(self, ops: list) -> list:
+        """Execute several operations in a single HTTP round-trip.
+
+        `ops` is a list of {"endpoint": ..., "params": ...} dicts, usually
+        built by passing `batch=` to the command methods. POSTs the list to
+        the lamp's /batch endpoint; if the firmware doesn't support it,
+        falls back to one request per operation. Returns the per-op
+        response data (or None) in order.
+        """
+        # Ops may change lamp state, so drop any cached status
+        self._status_cache = None
+
+        if self._batch_supported:
+            if orjson is not None:
+                payload = orjson.dumps(ops)
+            else:
+                import json
+                payload = json.dumps(ops).encode()
+            headers = {"Content-Type": "application/json"}
+
+            if self.compat:
+                import requests
+                try:
+                    response = self._session.post(f"{self.base_url}/batch", data=payload,
+                                                  headers=headers, timeout=self.timeout)
+                    if response.status_code in (404, 501):
+                        self._batch_supported = False
+                    else:
+                        response.raise_for_status()
+                        results = _json_loads(response.content)
+                        if isinstance(results, list) and len(results) == len(ops):
+                            return results
+                except (requests.exceptions.RequestException,) + _JSON_DECODE_ERRORS:
+                    pass
+            else:
+                import http.client
+                try:
+                    status, body = self._request_raw("POST", "/batch", body=payload,
+                                                     headers=headers)
+                    if status in (404, 501):
+                        self._batch_supported = False
+                    elif status < 400:
+                        results = _json_loads(body)
+                        if isinstance(results, list) and len(results) == len(ops):
+                            return results
+                except (OSError, http.client.HTTPException) + _JSON_DECODE_ERRORS:
+                    pass
+
+        # Firmware without /batch: run the ops sequentially. Once the
+        # probe has 404'd, skip straight here on every later call
+        return [self._make_request(op["endpoint"], op.get("params"))[1] for op in ops]
+
+    def pipeline(self, ops: list) -> bool:
+        """Send several GETs back-to-back on one socket without waiting.
+
+        `ops` is a list of (endpoint, params) tuples. HTTP/1.1 pipelining
+        collapses the sequence into roughly one round-trip, unlike /batch
+        it needs no firmware support beyond keep-alive. Falls back to
+        sequential requests if the lamp closes early or a response can't
+        be parsed (or in --compat mode, where the proxy owns the socket).
+        """
+        import socket
+        import urllib.parse
+
+        self._status_cache = None
+
+        if not self.compat:
+            frames = []
+            for i, (endpoint, params) in enumerate(ops):
+                path = f"/{endpoint}"
+                if params:
+                    path += "?" + urllib.parse.urlencode(params)
+                connection = "close" if i == len(ops) - 1 else "keep-alive"
+                frames.append(f"GET {path} HTTP/1.1\r\n"
+                              f"Host: {self.ip_address}\r\n"
+                              f"Connection: {connection}\r\n\r\n")
+
+            host, _, port = self.ip_address.partition(":")
+            try:
+                with socket.create_connection((host, int(port or 80)),
+                                              timeout=self.timeout) as sock:
+                    sock.sendall("".join(frames).encode())
+                    # Last response carries Connection: close, so the lamp
+                    # ends the stream when everything has been sent
+                    raw = b""
+                    while True:
+                        chunk = sock.recv(4096)
+                        if not chunk:
+                            break
+                        raw += chunk
+                return all(status < 400 for status, _ in
+                           self._split_pipelined(raw, len(ops)))
+            except (OSError, ValueError, IndexError):
+                pass
+
+        # Lamp (or proxy) didn't cooperate: plain sequential requests
+        ok = True
+        for endpoint, params in ops:
+            success, _ = self._make_request(endpoint, params)
+            ok = ok and success
+        return ok
+
+    @staticmethod
+    def _split_pipelined(raw: bytes, count: int) -> list:
+        """Split a pipelined byte stream into (status, body) pairs"""
+        results = []
+        rest = raw
+        for _ in range(count):
+            head, sep, rest = rest.partition(b"\r\n\r\n")
+            if not sep:
+                raise ValueError("truncated pipelined response")
+            lines = head.split(b"\r\n")
+            status = int(lines[0].split()[1])
+            length = 0
+            for line in lines[1:]:
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            results.append((status, rest[:length]))
+            rest = rest[length:]
+        return results
+
+    def quick_timer(self, minutes: int) -> bool:
+        """Turn the lamp on and set a timer in one pipelined round-trip"""
+        minutes = max(0, min(720, minutes))
+        if not self.quiet:
+            print(f"{Colors.YELLOW}Turning lamp ON with {minutes} minute timer...{Colors.RESET}")
+        params = _QUICK_TIMER_PARAMS.get(minutes) or {"minutes": minutes}
+        success = self.pipeline([("on", None), ("timeout", params)])
+        if success and not self.quiet:
+            print(f"{Colors.GREEN}Lamp ON - timer set for {minutes} minutes!{Colors.RESET}")
+        return success
+
+    def turn_on(self, batch: list = None) -> bool:
         """Turn lamp on"""
-        print(f"{Colors.YELLOW}Turning lamp ON...{Colors.RESET}")
+        if batch is not None:
+            batch.append({"endpoint": "on"})
+            return True
+        if not self.quiet:
+            print(self._MSG_ON)
         success, _ = self._make_request("on")
         if success:
-            print(f"{Colors.GREEN}Lamp turned ON successfully!{Colors.RESET}")
+            self._status_cache = None
+            if not self.quiet:
+                print(self._MSG_ON_OK)
         return success
-    
-    def turn_off(self) -> bool:
+
+    def turn_off(self, batch: list = None) -> bool:
         """Turn lamp off"""
-        print(f"{Colors.YELLOW}Turning lamp OFF...{Colors.RESET}")
+        if batch is not None:
+            batch.append({"endpoint": "off"})
+            return True
+        if not self.quiet:
+            print(self._MSG_OFF)
         success, _ = self._make_request("off")
         if success:
-            print(f"{Colors.GREEN}Lamp turned OFF successfully!{Colors.RESET}")
+            self._status_cache = None
+            if not self.quiet:
+                print(self._MSG_OFF_OK)
         return success
-    
-    def get_status(self) -> bool:
+
+    def get_status(self, batch: list = None) -> bool:
         """Get lamp status"""
-        print(f"{Colors.YELLOW}Getting lamp status...{Colors.RESET}")
-        success, data = self._make_request("status")
-        
+        if batch is not None:
+            batch.append({"endpoint": "status"})
+            return True
+        if not self.quiet:
+            print(self._MSG_STATUS)
+
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < self.status_ttl:
+            success, data = True, self._status_cache[1]
+        else:
+            success, data = self._make_request("status")
+            if success and data:
+                self._status_cache = (now, data)
+
+        # The status display is the command's payload, not progress
+        # chatter, so it prints even in quiet mode — scripted callers
+        # redirecting stdout still get the lamp state
         if success and data:
-            print(f"\n{Colors.BLUE}Raw status: {json.dumps(data, indent=2)}{Colors.RESET}\n")
-            
-            # Display parsed status
-            lamp_on = data.get('on', False)
-            timer_active = data.get('timeoutActive', False)
-            remaining = data.get('remainingSeconds', 0)
-            
-            status_color = Colors.GREEN if lamp_on else Colors.RED
-            status_text = "ON" if lamp_on else "OFF"
-            print(f"Lamp is currently {status_color}{status_text}{Colors.RESET}")
-            
-            if timer_active and remaining > 0:
-                minutes = remaining // 60
-                seconds = remaining % 60
-                print(f"{Colors.YELLOW}Timer is active - Time remaining: {minutes}:{seconds:02d}{Colors.RESET}")
-            else:
-                print("No timer active")
-        
+            self._print_status(data)
+
         return success
-    
-    def set_timer(self, minutes: int) -> bool:
+
+    def _print_status(self, data: dict):
+        """Display a parsed /status response"""
+        if orjson is not None:
+            raw = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        else:
+            import json
+            raw = json.dumps(data, indent=2)
+        print(f"\n{Colors.BLUE}Raw status: {raw}{Colors.RESET}\n")
+
+        lamp_on = data.get('on', False)
+        timer_active = data.get('timeoutActive', False)
+        remaining = data.get('remainingSeconds', 0)
+
+        status_color = Colors.GREEN if lamp_on else Colors.RED
+        status_text = "ON" if lamp_on else "OFF"
+        print(f"Lamp is currently {status_color}{status_text}{Colors.RESET}")
+
+        if timer_active and remaining > 0:
+            minutes = remaining // 60
+            seconds = remaining % 60
+            print(f"{Colors.YELLOW}Timer is active - Time remaining: {minutes}:{seconds:02d}{Colors.RESET}")
+        else:
+            print("No timer active")
+
+    def set_timer(self, minutes: int, batch: list = None) -> bool:
         """Set timer for specified minutes"""
         # Validate minutes
         minutes = max(0, min(720, minutes))
-        
-        if minutes == 0:
-            print(f"{Colors.YELLOW}Cancelling timer...{Colors.RESET}")
-        else:
-            print(f"{Colors.YELLOW}Setting timer for {minutes} minutes...{Colors.RESET}")
-        
-        success, _ = self._make_request("timeout", {"minutes": minutes})
-        
+
+        if batch is not None:
+            batch.append({"endpoint": "timeout", "params": {"minutes": minutes}})
+            return True
+
+        if not self.quiet:
+            if minutes == 0:
+                print(self._MSG_TIMER_CANCEL)
+            else:
+                print(f"{Colors.YELLOW}Setting timer for {minutes} minutes...{Colors.RESET}")
+
+        params = _QUICK_TIMER_PARAMS.get(minutes) or {"minutes": minutes}
+        success, _ = self._make_request("timeout", params)
+
         if success:
+            self._status_cache = None
+
+        if success and not self.quiet:
             if minutes == 0:
-                print(f"{Colors.GREEN}Timer cancelled successfully!{Colors.RESET}")
+                print(self._MSG_TIMER_CANCEL_OK)
             else:
                 print(f"{Colors.GREEN}Timer set for {minutes} minutes. Lamp will turn ON and auto-off!{Colors.RESET}")
-        
+
+        return success
+
+# One AsyncClient shared by every AsyncLampController so an N-lamp
+# fan-out pools connections instead of doing TCP setup per call. httpx
+# clients are bound to the event loop they first run on, so the cache is
+# keyed by running loop: each asyncio.run gets its own client instead of
+# crashing with "Event loop is closed" on the second run.
+_shared_clients = {}
+_atexit_registered = False
+
+def _get_shared_client():
+    global _atexit_registered
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    client = _shared_clients.get(loop)
+    if client is None:
+        import atexit
+        import httpx
+
+        # Sockets owned by a closed loop are dead; drop their clients
+        for stale in [l for l in _shared_clients if l.is_closed()]:
+            del _shared_clients[stale]
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32,
+                                max_connections=64,
+                                keepalive_expiry=30.0),
+            timeout=5)
+        _shared_clients[loop] = client
+        if not _atexit_registered:
+            atexit.register(_close_shared_clients)
+            _atexit_registered = True
+    return client
+
+def _install_uvloop():
+    """Install uvloop's event loop policy when available (Linux/Mac only).
+
+    Must run before the event loop starts: installing from inside a
+    running loop only affects later loops. Kept off the sync CLI's import
+    path by deferring the uvloop import here.
+    """
+    if sys.platform != "win32":
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
+
+def _close_shared_clients():
+    while _shared_clients:
+        loop, client = _shared_clients.popitem()
+        if loop.is_closed() or loop.is_running():
+            continue
+        try:
+            loop.run_until_complete(client.aclose())
+        except Exception:
+            pass
+
+
+class AsyncLampController:
+    """Async variant of LampController for controlling several lamps concurrently.
+
+    All instances running on the same event loop share one long-lived
+    httpx.AsyncClient, so awaits against any number of lamps reuse pooled
+    keep-alive connections; each asyncio.run gets a fresh client. Shared
+    clients are closed automatically at interpreter exit.
+
+    A semaphore caps how many requests are in flight at once; home routers
+    and ESP firmware both misbehave under unbounded fan-out. Pass a shared
+    semaphore to rate-limit a whole group of controllers together.
+    """
+
+    def __init__(self, ip_address: str, semaphore: "asyncio.Semaphore" = None):
+        import asyncio
+        try:
+            import httpx  # noqa: F401
+        except ImportError:
+            raise RuntimeError("httpx is required for async lamp control (pip install httpx)")
+        self.ip_address = ip_address
+        self.base_url = f"http://{ip_address}"
+        self.timeout = 5
+        self._sem = semaphore if semaphore is not None else asyncio.Semaphore(8)
+
+    async def _make_request(self, endpoint: str, params: dict = None) -> tuple[bool, "dict | None"]:
+        """Make HTTP request to lamp controller"""
+        import httpx
+        # Resolved per call: the shared client is keyed by running loop,
+        # which only exists once we're inside one
+        client = _get_shared_client()
+        try:
+            async with self._sem:
+                response = await client.get(f"{self.base_url}/{endpoint}", params=params)
+            response.raise_for_status()
+
+            # Try to parse JSON if response contains it
+            try:
+                return True, _json_loads(response.content)
+            except _JSON_DECODE_ERRORS:
+                return True, None
+
+        except httpx.HTTPError as e:
+            print(f"{Colors.RED}Error: Could not connect to lamp at {self.ip_address}{Colors.RESET}")
+            print(f"Make sure the IP address is correct and lamp is online.")
+            print(f"Details: {e}")
+            return False, None
+
+    async def turn_on(self) -> bool:
+        """Turn lamp on"""
+        success, _ = await self._make_request("on")
+        return success
+
+    async def turn_off(self) -> bool:
+        """Turn lamp off"""
+        success, _ = await self._make_request("off")
         return success
 
+    async def get_status(self) -> "dict | None":
+        """Get lamp status, returning the parsed JSON (or None on failure)"""
+        success, data = await self._make_request("status")
+        return data if success else None
+
+    async def set_timer(self, minutes: int) -> bool:
+        """Set timer for specified minutes"""
+        minutes = max(0, min(720, minutes))
+        success, _ = await self._make_request("timeout", {"minutes": minutes})
+        return success
+
+
+async def control_all(ips: list, command: str, minutes: int = 0,
+                      concurrency: int = 8) -> list:
+    """Run one command against many lamps concurrently.
+
+    Wall time is the slowest lamp's round-trip rather than the sum of all
+    of them. At most `concurrency` requests are in flight at once; tune it
+    down for flaky networks or up for beefy ones. Returns the per-lamp
+    results in the same order as `ips`.
+    """
+    import asyncio
+    sem = asyncio.Semaphore(concurrency)
+    controllers = [AsyncLampController(ip, semaphore=sem) for ip in ips]
+    if command == "timer":
+        tasks = [c.set_timer(minutes) for c in controllers]
+    else:
+        tasks = [getattr(c, {"on": "turn_on", "off": "turn_off", "status": "get_status"}[command])()
+                 for c in controllers]
+    return await asyncio.gather(*tasks)
+
+
+def run_control_all(ips: list, command: str, minutes: int = 0,
+                    concurrency: int = 8) -> list:
+    """Sync entry point for control_all.
+
+    Installs uvloop (when available) before starting the event loop, so
+    the whole fan-out runs on the faster loop. Calling
+    asyncio.run(control_all(...)) directly works too, but the first run
+    would stay on the stock loop since the policy can't take effect from
+    inside an already-running loop.
+    """
+    import asyncio
+    _install_uvloop()
+    return asyncio.run(control_all(ips, command, minutes, concurrency))
+
+
+def _clear_ansi():
+    sys.stdout.write("\033[H\033[2J\033[3J")
+    sys.stdout.flush()
+
+def _clear_legacy():
+    # Old Windows consoles don't understand ANSI escapes
+    os.system('cls')
+
+# Pick the clear implementation once at import instead of forking a
+# shell on every menu refresh
+_clear_fn = _clear_legacy if os.name == 'nt' and not os.environ.get('WT_SESSION') else _clear_ansi
+
 def clear_screen():
     """Clear terminal screen"""
-    import os
-    os.system('cls' if os.name == 'nt' else 'clear')
+    _clear_fn()
+
+def read_choice(prompt: str) -> str:
+    """Read a line of user input, skipping readline when stdin is a pipe"""
+    if sys.stdin.isatty():
+        return input(prompt).strip()
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
 
-def show_menu(controller: LampController = None):
+def show_menu(controller: LampController = None, compat: bool = False):
     """Show interactive menu"""
-    lamp_ip = controller.ip_address if controller else None
-    
-    while True:
+
+    # Built once; O(1) dispatch instead of walking an if/elif ladder.
+    # The lambdas close over `controller`, so IP changes are picked up.
+    actions = {
+        "1": lambda: controller.turn_on(),
+        "2": lambda: controller.turn_off(),
+        "3": lambda: controller.get_status(),
+        "5": lambda: controller.quick_timer(5),
+        "6": lambda: controller.quick_timer(30),
+        "7": lambda: controller.quick_timer(60),
+        "8": lambda: controller.set_timer(0),
+    }
+
+    def print_header():
         clear_screen()
         print(f"{Colors.BLUE}")
         print("=" * 44)
         print("        Smart Lamp Controller")
         print("=" * 44)
         print(f"{Colors.RESET}")
-        
-        # Get IP address if not provided
-        if not lamp_ip:
+
+    while True:
+        # Construct the controller exactly once per IP, so its keep-alive
+        # connection and status cache survive across menu iterations; only
+        # "Change IP address" tears it down
+        while controller is None:
+            print_header()
             lamp_ip = input("Enter lamp IP address: ").strip()
             if not lamp_ip:
                 print(f"{Colors.RED}IP address cannot be empty!{Colors.RESET}")
                 input("Press Enter to continue...")
                 continue
-            controller = LampController(lamp_ip)
-        
-        print(f"Current lamp IP: {Colors.CYAN}{lamp_ip}{Colors.RESET}")
+            controller = LampController(lamp_ip, compat=compat)
+
+        print_header()
+        print(f"Current lamp IP: {Colors.CYAN}{controller.ip_address}{Colors.RESET}")
         print()
         print("1. Turn lamp ON")
         print("2. Turn lamp OFF")
@@ -152,34 +673,31 @@ def show_menu(controller: LampController = None):
         print("0. Exit")
         print()
         
-        choice = input("Select option (0-9): ").strip()
-        
+        choice = read_choice("Select option (0-9): ")
+
         try:
-            if choice == "1":
-                controller.turn_on()
-            elif choice == "2":
-                controller.turn_off()
-            elif choice == "3":
-                controller.get_status()
+            action = actions.get(choice)
+            if action:
+                action()
             elif choice == "4":
                 try:
                     minutes = int(input("Enter timer minutes (1-720, 0 to cancel): "))
                 except ValueError:
                     minutes = 0
-                controller.set_timer(minutes)
-            elif choice == "5":
-                controller.set_timer(5)
-            elif choice == "6":
-                controller.set_timer(30)
-            elif choice == "7":
-                controller.set_timer(60)
-            elif choice == "8":
-                controller.set_timer(0)
+                # Batch the timer call with a status fetch so the new state
+                # is shown without a second round-trip
+                ops = []
+                controller.set_timer(minutes, batch=ops)
+                controller.get_status(batch=ops)
+                results = controller.batch(ops)
+                if results[1] is not None:
+                    controller._print_status(results[1])
             elif choice == "9":
-                lamp_ip = None
+                controller.close()
                 controller = None
                 continue
             elif choice == "0":
+                controller.close()
                 print("Goodbye!")
                 break
             else:
@@ -196,13 +714,27 @@ def show_menu(controller: LampController = None):
 
 def main():
     """Main function"""
-    # Parse command line arguments
-    if len(sys.argv) == 1:
+    args = sys.argv[1:]
+
+    # Quiet mode: --quiet/-q, LAMP_QUIET=1, or stdout not a terminal
+    quiet = os.environ.get("LAMP_QUIET") == "1" or not sys.stdout.isatty()
+    for flag in ("--quiet", "-q"):
+        if flag in args:
+            args.remove(flag)
+            quiet = True
+
+    # --compat selects the requests-based transport (proxy support)
+    compat = False
+    if "--compat" in args:
+        args.remove("--compat")
+        compat = True
+
+    if not args:
         # No arguments - show menu
-        show_menu()
+        show_menu(compat=compat)
         return
-    
-    if len(sys.argv) < 3:
+
+    if len(args) < 2:
         print(f"{Colors.RED}Usage: {sys.argv[0]} [IP_ADDRESS] [COMMAND] [TIMER_MINUTES]{Colors.RESET}")
         print("Commands: on, off, status, timer")
         print("Examples:")
@@ -211,10 +743,10 @@ def main():
         print(f"  {sys.argv[0]}  # Interactive menu")
         sys.exit(1)
     
-    ip_address = sys.argv[1]
-    command = sys.argv[2].lower()
-    
-    controller = LampController(ip_address)
+    ip_address = args[0]
+    command = args[1].lower()
+
+    controller = LampController(ip_address, quiet=quiet, compat=compat)
     
     if command == "on":
         success = controller.turn_on()
@@ -223,13 +755,13 @@ def main():
     elif command == "status":
         success = controller.get_status()
     elif command == "timer":
-        if len(sys.argv) < 4:
+        if len(args) < 3:
             print(f"{Colors.RED}Error: Timer command requires minutes parameter{Colors.RESET}")
             print(f"Usage: {sys.argv[0]} {ip_address} timer [minutes]")
             sys.exit(1)
-        
+
         try:
-            minutes = int(sys.argv[3])
+            minutes = int(args[2])
         except ValueError:
             print(f"{Colors.RED}Error: Timer minutes must be a number{Colors.RESET}")
             sys.exit(1)
@@ -239,7 +771,8 @@ def main():
         print(f"{Colors.RED}Invalid command: {command}{Colors.RESET}")
         print("Valid commands: on, off, status, timer")
         sys.exit(1)
-    
+
+    controller.close()
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":